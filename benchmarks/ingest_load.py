@@ -0,0 +1,71 @@
+"""Prueba de carga local del servidor de ingesta.
+
+Uso (con el servidor corriendo: python -m ingestion.server):
+    python -m benchmarks.ingest_load --requests 20000 --concurrency 64
+"""
+import argparse
+import asyncio
+import random
+import time
+import aiohttp
+from config.settings import TRUCK_TYPES, GPS_ROUTES, INGEST_HOST, INGEST_PORT
+
+
+def build_reading(truck_index, truck_type, route_name):
+    """Genera una lectura sintética para un camión."""
+    lat, lon = random.choice(GPS_ROUTES[route_name])
+    return {
+        "truck_id": f"truck-{truck_index}",
+        "truck_type": truck_type,
+        "route_name": route_name,
+        "door_open": random.random() < 0.05,
+        "weight": random.uniform(0, TRUCK_TYPES[truck_type]["max_weight_capacity"]),
+        "fuel": random.uniform(0, 100),
+        "lat": lat,
+        "lon": lon,
+    }
+
+
+async def worker(session, url, readings, counter):
+    """Envía lecturas una tras otra por una conexión."""
+    errors = 0
+    while True:
+        index = counter[0]
+        if index >= len(readings):
+            return errors
+        counter[0] += 1
+        async with session.post(url, json=readings[index]) as response:
+            await response.read()
+            if response.status != 202:
+                errors += 1
+
+
+async def run(url, total_requests, concurrency, trucks):
+    truck_types = list(TRUCK_TYPES.keys())
+    route_names = list(GPS_ROUTES.keys())
+    fleet = [(i, random.choice(truck_types), random.choice(route_names)) for i in range(trucks)]
+    readings = [build_reading(*random.choice(fleet)) for _ in range(total_requests)]
+
+    counter = [0]
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        errors = await asyncio.gather(*(worker(session, url, readings, counter) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    print(f"Peticiones: {total_requests}  Errores: {sum(errors)}")
+    print(f"Tiempo: {elapsed:.2f} s  Rendimiento: {total_requests / elapsed:.0f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga del servidor de ingesta.")
+    parser.add_argument("--url", default=f"http://{INGEST_HOST}:{INGEST_PORT}/readings")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--trucks", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.requests, args.concurrency, args.trucks))
+
+
+if __name__ == "__main__":
+    main()
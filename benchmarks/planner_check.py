@@ -0,0 +1,63 @@
+"""Verificación y benchmark del planeador de viajes.
+
+Compara las probabilidades y el combustible esperado de plan_trips con una
+simulación Monte Carlo del mismo modelo (capacidad del tanque uniforme,
+tanque inicial de INITIAL_FUEL_FRACTION) y mide el tiempo de evaluar miles
+de combinaciones tipo de camión × ruta × carga.
+
+Uso:
+    python -m benchmarks.planner_check --samples 200000 --loads 1000
+"""
+import argparse
+import time
+import numpy as np
+from config.settings import TRUCK_TYPES, LOW_FUEL_THRESHOLD, INITIAL_FUEL_FRACTION
+from simulation.planner import plan_trips
+
+
+def monte_carlo_check(samples, seed):
+    """Diferencia máxima entre plan_trips y la estimación Monte Carlo para cada métrica."""
+    rng = np.random.default_rng(seed)
+    plan = plan_trips()
+    errors = {"expected_fuel_liters": 0.0, "low_fuel_probability": 0.0, "out_of_fuel_probability": 0.0}
+    for t, truck_type in enumerate(plan["truck_types"]):
+        config = TRUCK_TYPES[truck_type]
+        capacities = rng.uniform(config["min_fuel_capacity"], config["max_fuel_capacity"], samples)
+        for r in range(len(plan["route_names"])):
+            for l in range(len(plan["load_fractions"])):
+                used = plan["fuel_used_liters"][t, r, l]
+                arrival = np.maximum(INITIAL_FUEL_FRACTION * capacities - used, 0.0)
+                estimates = {
+                    "expected_fuel_liters": arrival.mean(),
+                    "low_fuel_probability": (100.0 * arrival / capacities <= LOW_FUEL_THRESHOLD).mean(),
+                    "out_of_fuel_probability": (INITIAL_FUEL_FRACTION * capacities < used).mean(),
+                }
+                for name, estimate in estimates.items():
+                    errors[name] = max(errors[name], abs(plan[name][t, r, l] - estimate))
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verificación Monte Carlo y benchmark del planeador.")
+    parser.add_argument("--samples", type=int, default=200000, help="Muestras Monte Carlo por combinación.")
+    parser.add_argument("--loads", type=int, default=1000, help="Fracciones de carga en el benchmark.")
+    parser.add_argument("--repeats", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    errors = monte_carlo_check(args.samples, args.seed)
+    print(f"Diferencia máxima contra Monte Carlo ({args.samples} muestras por combinación):")
+    for name, error in errors.items():
+        print(f"  {name}: {error:.4f}")
+
+    loads = np.linspace(0.0, 1.0, args.loads)
+    plan = plan_trips(load_fractions=loads)
+    start = time.perf_counter()
+    for _ in range(args.repeats):
+        plan_trips(load_fractions=loads)
+    elapsed_ms = (time.perf_counter() - start) / args.repeats * 1000.0
+    print(f"Combinaciones: {plan['eta_hours'].size}  Tiempo por evaluación: {elapsed_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark del detector de robo de carga sobre una flota grande.
+
+Simula N camiones muestreados a 1 Hz con la pérdida de peso normal del
+Simulator (0.1% - 0.5% de la capacidad por muestra) e inyecta robos en una
+fracción de ellos, repartidos en tres escenarios:
+- repentino con la puerta abierta,
+- repentino con la puerta cerrada,
+- lento y sostenido con la puerta cerrada.
+
+Reporta el tiempo por muestra de toda la flota frente al presupuesto de
+1 segundo y, por escenario, los robos detectados y el retraso de detección.
+
+Uso:
+    python -m benchmarks.theft_detector_bench --trucks 100000 --samples 300
+"""
+import argparse
+import time
+import numpy as np
+from config.settings import TRUCK_TYPES, GPS_ROUTES
+from simulation.theft_detector import WeightTheftDetector
+
+SCENARIOS = ("repentino, puerta abierta", "repentino, puerta cerrada", "lento, puerta cerrada")
+
+
+def run(trucks, samples, theft_fraction, theft_drop, gradual_drop, gradual_samples, seed):
+    rng = np.random.default_rng(seed)
+    capacity_options = np.array([config["max_weight_capacity"] for config in TRUCK_TYPES.values()], dtype=float)
+    capacities = rng.choice(capacity_options, trucks)
+    route_points = np.array([point for route in GPS_ROUTES.values() for point in route])
+    locations = route_points[rng.integers(0, len(route_points), trucks)]
+
+    weights = capacities * rng.uniform(0.7, 0.95, trucks)
+    thieves = rng.random(trucks) < theft_fraction
+    scenario = np.where(thieves, rng.integers(0, len(SCENARIOS), trucks), -1)
+    # Antes de la mitad, para que aún quede carga que robar
+    theft_time = rng.integers(samples // 10, samples // 2, trucks)
+    sudden = (scenario == 0) | (scenario == 1)
+    gradual = scenario == 2
+
+    detector = WeightTheftDetector(capacities)
+    detection_time = np.full(trucks, -1)
+    false_alarms = np.zeros(trucks, dtype=bool)
+    elapsed = []
+    for t in range(samples):
+        weights -= rng.uniform(0.001, 0.005, trucks) * capacities
+        stolen_now = sudden & (theft_time == t)
+        weights[stolen_now] -= theft_drop * capacities[stolen_now]
+        stealing = gradual & (theft_time <= t) & (t < theft_time + gradual_samples)
+        weights[stealing] -= gradual_drop * capacities[stealing]
+        np.maximum(weights, 0.0, out=weights)
+        door_open = ((scenario == 0) & stolen_now) | (rng.random(trucks) < 0.05)
+
+        start = time.perf_counter()
+        alarms = detector.update(weights, door_open, locations)
+        elapsed.append(time.perf_counter() - start)
+
+        theft_started = thieves & (theft_time <= t)
+        detection_time = np.where(alarms & theft_started & (detection_time < 0), t, detection_time)
+        false_alarms |= alarms & ~theft_started
+
+    elapsed_ms = np.array(elapsed) * 1000.0
+    print(f"Camiones: {trucks}  Muestras: {samples}")
+    print(f"Tiempo por muestra de la flota (ms): media={elapsed_ms.mean():.2f}  "
+          f"p99={np.percentile(elapsed_ms, 99):.2f}  max={elapsed_ms.max():.2f}")
+    print(f"Uso del presupuesto de 1 Hz: {elapsed_ms.mean() / 10.0:.2f}%")
+    print(f"Robo repentino: {theft_drop:.1%} de la capacidad; "
+          f"lento: {gradual_drop:.2%} extra por muestra durante {gradual_samples} muestras")
+    for index, name in enumerate(SCENARIOS):
+        members = scenario == index
+        detected = members & (detection_time >= 0)
+        delays = detection_time[detected] - theft_time[detected]
+        delay = f"{delays.mean():.1f}" if len(delays) else "-"
+        print(f"  {name}: detectados {detected.sum()} / {members.sum()}  retraso medio (muestras): {delay}")
+    print(f"Camiones con falsas alarmas: {false_alarms.sum()} / {trucks}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del detector de robo de carga.")
+    parser.add_argument("--trucks", type=int, default=100000)
+    parser.add_argument("--samples", type=int, default=300)
+    parser.add_argument("--theft-fraction", type=float, default=0.01)
+    parser.add_argument("--theft-drop", type=float, default=0.05, help="Fracción de la capacidad robada de golpe.")
+    parser.add_argument("--gradual-drop", type=float, default=0.0045,
+                        help="Fracción de la capacidad robada por muestra en el robo lento.")
+    parser.add_argument("--gradual-samples", type=int, default=30, help="Duración del robo lento en muestras.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.trucks, args.samples, args.theft_fraction, args.theft_drop,
+        args.gradual_drop, args.gradual_samples, args.seed)
+
+
+if __name__ == "__main__":
+    main()
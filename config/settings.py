@@ -4,21 +4,29 @@ TRUCK_TYPES = {
         "max_weight_capacity": 3.5,
         "min_fuel_capacity": 240, # Asumiendo un valor único si no hay rango
         "max_fuel_capacity": 240,
+        "fuel_consumption_empty": 14, # L/100 km sin carga
+        "fuel_consumption_full": 18, # L/100 km a capacidad máxima
     },
     "Camión Rabón": {
         "max_weight_capacity": 9,
         "min_fuel_capacity": 150,
         "max_fuel_capacity": 300,
+        "fuel_consumption_empty": 25, # L/100 km sin carga
+        "fuel_consumption_full": 35, # L/100 km a capacidad máxima
     },
     "Camión Torton": {
         "max_weight_capacity": 18,
         "min_fuel_capacity": 400,
         "max_fuel_capacity": 800,
+        "fuel_consumption_empty": 32, # L/100 km sin carga
+        "fuel_consumption_full": 45, # L/100 km a capacidad máxima
     },
     "Tráiler Sencillo": {
         "max_weight_capacity": 30,
         "min_fuel_capacity": 500,
         "max_fuel_capacity": 900,
+        "fuel_consumption_empty": 38, # L/100 km sin carga
+        "fuel_consumption_full": 55, # L/100 km a capacidad máxima
     }
 }
 
@@ -73,6 +81,15 @@ DEFAULT_DOOR_OPEN_PROBABILITY = 5 # %
 DEFAULT_PANIC_BUTTON_PROBABILITY = 2 # %
 DEFAULT_OVERWEIGHT_PROBABILITY = 10 # %
 LOW_FUEL_THRESHOLD = 20 # %
+INITIAL_FUEL_FRACTION = 0.88 # Fracción del tanque con la que inicia cada camión
 FUEL_CONSUMPTION_RATE = 0.5 # % del tanque consumido por paso de GPS
 SIMULATION_STEP_DELAY_SECONDS = 2 # Tiempo entre pasos de GPS
 DOOR_OPEN_PAUSE_SECONDS = 5 # Tiempo extra si la puerta se abre
+AVERAGE_SPEED_KMH = 50 # Velocidad promedio para estimar tiempos de llegada
+
+# Ingesta de lecturas de dispositivos reales (ingestion/server.py)
+INGEST_HOST = "127.0.0.1"
+INGEST_PORT = 8080
+INGEST_FLUSH_INTERVAL_SECONDS = 0.1 # Cada cuánto se aplican las lecturas acumuladas
+INGEST_MAX_ALERTS_PER_TRUCK = 100 # Alertas conservadas por camión en la ingesta
+INGEST_MAX_WEIGHT_FACTOR = 2 # Peso máximo aceptado, en múltiplos de max_weight_capacity
@@ -0,0 +1,128 @@
+import argparse
+import asyncio
+import json
+from aiohttp import web, WSMsgType
+from ingestion.service import IngestionService, validate_payload
+from config.settings import INGEST_HOST, INGEST_PORT
+
+SERVICE_KEY = web.AppKey("service", IngestionService)
+TCP_SERVER_KEY = web.AppKey("tcp_server", asyncio.Server)
+
+
+def _ingest(service, text):
+    """Decodifica, valida y registra un mensaje JSON. Devuelve la respuesta y el código HTTP."""
+    try:
+        payload = json.loads(text)
+    except (ValueError, RecursionError):
+        return {"error": "JSON inválido."}, 400
+    try:
+        accepted = service.submit(validate_payload(payload))
+    except ValueError as e:
+        return {"error": str(e)}, 422
+    return {"accepted": accepted}, 202
+
+
+async def post_readings(request):
+    """POST /readings: recibe una lectura o un lote de lecturas."""
+    body, status = _ingest(request.app[SERVICE_KEY], await request.text())
+    return web.json_response(body, status=status)
+
+
+async def readings_websocket(request):
+    """GET /ws: cada mensaje de texto es una lectura o un lote; se responde con el resultado.
+
+    Los mensajes binarios se responden con un error.
+    """
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+    service = request.app[SERVICE_KEY]
+    async for msg in ws:
+        if msg.type == WSMsgType.TEXT:
+            body, _ = _ingest(service, msg.data)
+            await ws.send_json(body)
+        elif msg.type == WSMsgType.BINARY:
+            await ws.send_json({"error": "Solo se aceptan mensajes de texto JSON."})
+        elif msg.type == WSMsgType.ERROR:
+            break
+    return ws
+
+
+async def get_truck(request):
+    """GET /trucks/{truck_id}: estado actual de un camión."""
+    snapshot = request.app[SERVICE_KEY].truck_snapshot(request.match_info["truck_id"])
+    if snapshot is None:
+        return web.json_response({"error": "Camión no encontrado."}, status=404)
+    return web.json_response(snapshot)
+
+
+async def get_stats(request):
+    """GET /stats: contadores de lecturas aceptadas y aplicadas."""
+    service = request.app[SERVICE_KEY]
+    return web.json_response({**service.stats, "trucks": len(service.trucks)})
+
+
+async def handle_tcp_client(service, reader, writer):
+    """Protocolo TCP: una lectura o lote JSON por línea; se responde una línea JSON por mensaje."""
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            body, _ = _ingest(service, line)
+            writer.write(json.dumps(body).encode() + b"\n")
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def _start_service(app):
+    app[SERVICE_KEY].start()
+
+
+async def _stop_service(app):
+    await app[SERVICE_KEY].stop()
+
+
+def create_app(service=None):
+    """Crea la aplicación aiohttp con los endpoints de ingesta."""
+    app = web.Application()
+    app[SERVICE_KEY] = service or IngestionService()
+    app.router.add_post("/readings", post_readings)
+    app.router.add_get("/ws", readings_websocket)
+    app.router.add_get("/trucks/{truck_id}", get_truck)
+    app.router.add_get("/stats", get_stats)
+    app.on_startup.append(_start_service)
+    app.on_cleanup.append(_stop_service)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de ingesta de lecturas IoT de camiones.")
+    parser.add_argument("--host", default=INGEST_HOST)
+    parser.add_argument("--port", type=int, default=INGEST_PORT)
+    parser.add_argument("--tcp-port", type=int, default=None, help="Puerto opcional para ingesta TCP (JSON por línea).")
+    args = parser.parse_args()
+
+    app = create_app()
+    if args.tcp_port is not None:
+        async def start_tcp(app):
+            service = app[SERVICE_KEY]
+            app[TCP_SERVER_KEY] = await asyncio.start_server(
+                lambda reader, writer: handle_tcp_client(service, reader, writer), args.host, args.tcp_port
+            )
+
+        async def stop_tcp(app):
+            app[TCP_SERVER_KEY].close()
+            await app[TCP_SERVER_KEY].wait_closed()
+
+        app.on_startup.append(start_tcp)
+        app.on_cleanup.append(stop_tcp)
+    # Sin access log: el registro por petición limita el rendimiento
+    web.run_app(app, host=args.host, port=args.port, access_log=None)
+
+
+# Para ejecutar: python -m ingestion.server
+if __name__ == "__main__":
+    main()
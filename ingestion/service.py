@@ -0,0 +1,263 @@
+import asyncio
+import math
+import numpy as np
+from simulation.truck import Truck
+from simulation.theft_detector import WeightTheftDetector
+from config.settings import (
+    TRUCK_TYPES, GPS_ROUTES, LOW_FUEL_THRESHOLD, INGEST_FLUSH_INTERVAL_SECONDS,
+    INGEST_MAX_ALERTS_PER_TRUCK, INGEST_MAX_WEIGHT_FACTOR
+)
+
+# Campos de sensores que puede traer una lectura
+SENSOR_FIELDS = ("door_open", "panic", "weight", "fuel", "lat", "lon")
+
+
+def _require_number(reading, field, min_val, max_val):
+    """Valida que un campo sea numérico y esté dentro de un rango."""
+    value = reading[field]
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"El campo '{field}' debe ser numérico.")
+    try:
+        value = float(value)
+    except OverflowError:
+        value = math.inf
+    if not math.isfinite(value):
+        raise ValueError(f"El campo '{field}' debe ser un número finito.")
+    if not min_val <= value <= max_val:
+        raise ValueError(f"El campo '{field}' está fuera de rango ({min_val} - {max_val}).")
+    return value
+
+
+def validate_reading(raw):
+    """Valida una lectura cruda y devuelve un diccionario normalizado.
+
+    Lanza ValueError si la lectura no es válida.
+    """
+    if not isinstance(raw, dict):
+        raise ValueError("La lectura debe ser un objeto JSON.")
+    truck_id = raw.get("truck_id")
+    if not isinstance(truck_id, str) or not truck_id:
+        raise ValueError("La lectura debe incluir 'truck_id'.")
+
+    reading = {"truck_id": truck_id}
+    for field in ("truck_type", "route_name"):
+        if field in raw:
+            if not isinstance(raw[field], str):
+                raise ValueError(f"El campo '{field}' debe ser texto.")
+            reading[field] = raw[field]
+
+    for field in ("door_open", "panic"):
+        if field in raw:
+            if not isinstance(raw[field], bool):
+                raise ValueError(f"El campo '{field}' debe ser booleano.")
+            reading[field] = raw[field]
+
+    if "weight" in raw:
+        # El límite superior depende del tipo de camión y se verifica en IngestionService.submit
+        reading["weight"] = _require_number(raw, "weight", 0, math.inf)
+    if "fuel" in raw:
+        reading["fuel"] = _require_number(raw, "fuel", 0, 100)
+
+    if ("lat" in raw) != ("lon" in raw):
+        raise ValueError("La ubicación requiere 'lat' y 'lon'.")
+    if "lat" in raw:
+        reading["lat"] = _require_number(raw, "lat", -90, 90)
+        reading["lon"] = _require_number(raw, "lon", -180, 180)
+    return reading
+
+
+def validate_payload(payload):
+    """Valida una lectura individual o un lote (lista) de lecturas."""
+    readings = payload if isinstance(payload, list) else [payload]
+    validated = []
+    for index, raw in enumerate(readings):
+        try:
+            validated.append(validate_reading(raw))
+        except ValueError as e:
+            raise ValueError(f"Lectura {index}: {e}") from None
+    return validated
+
+
+class IngestionService:
+    """Recibe lecturas de dispositivos, las agrupa por camión y las aplica a cada Truck."""
+
+    def __init__(self, flush_interval=INGEST_FLUSH_INTERVAL_SECONDS, low_fuel_threshold=LOW_FUEL_THRESHOLD):
+        self.trucks = {} # truck_id -> Truck
+        self.flush_interval = flush_interval
+        self.low_fuel_threshold = low_fuel_threshold
+        self._pending = {} # truck_id -> lecturas combinadas desde el último flush
+        self._flush_task = None
+        self._alert_state = {} # truck_id -> último estado de sobrepeso / combustible bajo
+        # Detector de robo de carga de toda la flota; crece al registrar camiones
+        self.theft_detector = WeightTheftDetector()
+        self._detector_index = {} # truck_id -> índice en theft_detector
+        self.stats = {"accepted": 0, "applied": 0}
+
+    def submit(self, readings):
+        """Registra lecturas ya validadas; se aplican en el siguiente flush.
+
+        Si alguna lectura del lote es inválida no se registra ningún camión nuevo.
+        """
+        new_trucks = {} # truck_id -> (tipo, ruta) de camiones aún no registrados
+        for index, reading in enumerate(readings):
+            try:
+                self._check_reading(reading, new_trucks)
+            except ValueError as e:
+                raise ValueError(f"Lectura {index}: {e}") from None
+        for truck_id, (truck_type, route_name) in new_trucks.items():
+            truck = self.trucks[truck_id] = Truck(truck_type, route_name)
+            self._detector_index[truck_id] = self.theft_detector.add(truck.max_weight_capacity)
+
+        for reading in readings:
+            merged = self._pending.get(reading["truck_id"])
+            if merged is None:
+                merged = self._pending[reading["truck_id"]] = {}
+            for field in SENSOR_FIELDS:
+                if field in reading:
+                    merged[field] = reading[field]
+            # Los eventos de pánico y apertura de puerta no se pierden al combinar lecturas
+            if reading.get("panic"):
+                merged["panic_triggered"] = True
+            if reading.get("door_open"):
+                merged["door_was_opened"] = True
+        self.stats["accepted"] += len(readings)
+        return len(readings)
+
+    def _check_reading(self, reading, new_trucks):
+        """Verifica que el camión de la lectura exista o pueda registrarse y que el peso sea plausible."""
+        truck_id = reading["truck_id"]
+        truck = self.trucks.get(truck_id)
+        if truck is not None:
+            registered = (truck.truck_type, truck.route_name)
+        else:
+            registered = new_trucks.get(truck_id)
+        if registered is None:
+            if "truck_type" not in reading or "route_name" not in reading:
+                raise ValueError(
+                    f"Camión desconocido '{truck_id}': la primera lectura debe incluir 'truck_type' y 'route_name'."
+                )
+            if reading["truck_type"] not in TRUCK_TYPES:
+                raise ValueError(f"Tipo de camión desconocido: {reading['truck_type']}")
+            if reading["route_name"] not in GPS_ROUTES:
+                raise ValueError(f"Ruta desconocida: {reading['route_name']}")
+            registered = new_trucks[truck_id] = (reading["truck_type"], reading["route_name"])
+        else:
+            # Un camión registrado no cambia de tipo ni de ruta
+            truck_type, route_name = registered
+            if reading.get("truck_type", truck_type) != truck_type:
+                raise ValueError(f"El camión '{truck_id}' está registrado como '{truck_type}', no '{reading['truck_type']}'.")
+            if reading.get("route_name", route_name) != route_name:
+                raise ValueError(f"El camión '{truck_id}' está registrado en la ruta '{route_name}', no '{reading['route_name']}'.")
+
+        max_weight = INGEST_MAX_WEIGHT_FACTOR * TRUCK_TYPES[registered[0]]["max_weight_capacity"]
+        if reading.get("weight", 0) > max_weight:
+            raise ValueError(f"El campo 'weight' está fuera de rango (0 - {max_weight}).")
+
+    def flush(self):
+        """Aplica las lecturas acumuladas a cada camión y ejecuta las verificaciones."""
+        pending, self._pending = self._pending, {}
+        for truck_id, merged in pending.items():
+            self._apply(truck_id, self.trucks[truck_id], merged)
+        self._detect_theft(pending)
+        for truck_id in pending:
+            truck = self.trucks[truck_id]
+            if len(truck.alerts) > INGEST_MAX_ALERTS_PER_TRUCK:
+                truck.alerts = truck.alerts[-INGEST_MAX_ALERTS_PER_TRUCK:]
+        self.stats["applied"] += len(pending)
+        return len(pending)
+
+    def _detect_theft(self, pending):
+        """Pasa al detector, en una sola llamada, el peso de cada camión que reportó peso."""
+        truck_ids = [truck_id for truck_id, merged in pending.items() if "weight" in merged]
+        if not truck_ids:
+            return
+        trucks = [self.trucks[truck_id] for truck_id in truck_ids]
+        indices = [self._detector_index[truck_id] for truck_id in truck_ids]
+        weights = [truck.current_weight for truck in trucks]
+        door_open = [
+            truck.door_open or pending[truck_id].get("door_was_opened", False)
+            for truck_id, truck in zip(truck_ids, trucks)
+        ]
+        locations = [truck.get_current_location() or (math.nan, math.nan) for truck in trucks]
+
+        alarms = self.theft_detector.update(weights, door_open, locations, indices)
+        if not alarms.any():
+            return
+        alarm_indices = np.asarray(indices)[alarms]
+        dropped = self.theft_detector.dropped_weight(np.asarray(weights)[alarms], alarm_indices)
+        start_locations = self.theft_detector.drop_start_locations(alarm_indices)
+        for position, dropped_weight, start_location in zip(np.flatnonzero(alarms), dropped, start_locations):
+            start_location = None if np.isnan(start_location).any() else tuple(start_location)
+            trucks[position].report_possible_theft(dropped_weight, start_location)
+
+    def _apply(self, truck_id, truck, merged):
+        """Aplica una lectura combinada a un camión."""
+        if "lat" in merged:
+            truck.update_location(merged["lat"], merged["lon"])
+        if "weight" in merged:
+            truck.set_weight(merged["weight"])
+        if "fuel" in merged:
+            truck.set_fuel_percentage(merged["fuel"])
+
+        if merged.get("door_was_opened") and not truck.door_open:
+            truck.set_door_status(True)
+        if "door_open" in merged:
+            truck.set_door_status(merged["door_open"])
+
+        if merged.get("panic_triggered"):
+            truck.trigger_panic_button()
+        elif merged.get("panic") is False:
+            truck.panic_button_on = False
+
+        # Solo se alerta cuando cambia el estado, no en cada flush
+        state = self._alert_state.setdefault(truck_id, {"overweight": False, "low_fuel": False})
+        overweight = truck.current_weight > truck.max_weight_capacity
+        if overweight and not state["overweight"]:
+            truck.check_overweight()
+        low_fuel = truck.is_en_route and truck.get_fuel_percentage() <= self.low_fuel_threshold
+        if low_fuel and not state["low_fuel"]:
+            truck.check_low_fuel(self.low_fuel_threshold)
+        state["overweight"] = overweight
+        state["low_fuel"] = low_fuel
+
+    def truck_snapshot(self, truck_id):
+        """Devuelve el estado actual de un camión para el dashboard."""
+        truck = self.trucks.get(truck_id)
+        if truck is None:
+            return None
+        return {
+            "truck_id": truck_id,
+            "truck_type": truck.truck_type,
+            "route_name": truck.route_name,
+            "location": truck.get_current_location(),
+            "door_open": truck.door_open,
+            "panic_button_on": truck.panic_button_on,
+            "weight": truck.current_weight,
+            "weight_percentage": truck.get_weight_percentage(),
+            "fuel_percentage": truck.get_fuel_percentage(),
+            "route_progress": truck.get_route_progress(),
+            "alerts": truck.alerts[-10:],
+        }
+
+    async def run(self):
+        """Ciclo que aplica las lecturas acumuladas cada `flush_interval` segundos."""
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                self.flush()
+        finally:
+            self.flush() # No perder lecturas pendientes al detener
+
+    def start(self):
+        """Inicia el ciclo de flush en el event loop actual."""
+        self._flush_task = asyncio.ensure_future(self.run())
+
+    async def stop(self):
+        """Detiene el ciclo de flush."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
@@ -0,0 +1,131 @@
+"""Planeación de viajes: ETA y viabilidad de combustible para cada tipo de camión × ruta × carga.
+
+Todas las combinaciones se evalúan a la vez con broadcasting de numpy:
+tipos de camión en el eje 0, rutas en el eje 1 y cargas en el eje 2.
+
+Modelo:
+- Distancia de la ruta: suma de distancias haversine entre sus puntos GPS.
+- Consumo (L/100 km): interpolación lineal entre `fuel_consumption_empty` y
+  `fuel_consumption_full` según la fracción de carga.
+- Capacidad del tanque: uniforme entre `min_fuel_capacity` y `max_fuel_capacity`
+  (igual que en Truck), con el tanque inicial de INITIAL_FUEL_FRACTION. Es el
+  nivel con el que arranca una simulación de Simulator.start, que no recarga
+  combustible; Truck.start_loading (usado por el generador de carga) llena al 90%.
+- El combustible solo disminuye en ruta, así que la alerta de combustible bajo
+  ocurre si y solo si el nivel al llegar queda por debajo del umbral.
+"""
+import numpy as np
+import pandas as pd
+from config.settings import TRUCK_TYPES, GPS_ROUTES, LOW_FUEL_THRESHOLD, AVERAGE_SPEED_KMH, INITIAL_FUEL_FRACTION
+
+EARTH_RADIUS_KM = 6371.0
+DEFAULT_LOAD_FRACTIONS = (0.0, 0.25, 0.5, 0.75, 1.0)
+
+
+def route_distance_table(route):
+    """Distancias acumuladas (km) desde el inicio de la ruta hasta cada punto."""
+    points = np.radians(np.asarray(route, dtype=float))
+    lat, lon = points[:, 0], points[:, 1]
+    dlat, dlon = np.diff(lat), np.diff(lon)
+    h = np.sin(dlat / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(dlon / 2) ** 2
+    segments = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(h))
+    return np.concatenate(([0.0], np.cumsum(segments)))
+
+
+# Tablas precalculadas por ruta
+ROUTE_DISTANCE_TABLES = {name: route_distance_table(route) for name, route in GPS_ROUTES.items()}
+ROUTE_DISTANCES_KM = {name: float(table[-1]) for name, table in ROUTE_DISTANCE_TABLES.items()}
+
+
+def _uniform_cdf(x, low, high):
+    """P(C <= x) para C uniforme en [low, high]; si low == high es un escalón."""
+    width = high - low
+    safe_width = np.where(width > 0, width, 1.0)
+    ramp = np.clip((x - low) / safe_width, 0.0, 1.0)
+    return np.where(width > 0, ramp, (x >= low).astype(float))
+
+
+def _uniform_expected_excess(x, low, high):
+    """E[max(C - x, 0)] para C uniforme en [low, high]."""
+    width = high - low
+    safe_width = np.where(width > 0, width, 1.0)
+    partial = np.clip(high - x, 0.0, None) ** 2 / (2 * safe_width)
+    excess = np.where(x <= low, (low + high) / 2 - x, partial)
+    return np.where(width > 0, excess, np.clip(low - x, 0.0, None))
+
+
+def plan_trips(truck_types=None, route_names=None, load_fractions=DEFAULT_LOAD_FRACTIONS,
+               low_fuel_threshold=LOW_FUEL_THRESHOLD, average_speed_kmh=AVERAGE_SPEED_KMH):
+    """Evalúa todas las combinaciones tipo de camión × ruta × carga.
+
+    `load_fractions` son fracciones de `max_weight_capacity` (1.0 = carga máxima).
+    Devuelve un diccionario con las etiquetas de cada eje y arreglos de forma
+    (tipos, rutas, cargas):
+    - eta_hours: tiempo estimado de llegada.
+    - fuel_used_liters: combustible consumido en la ruta.
+    - expected_fuel_liters: combustible esperado al llegar.
+    - low_fuel_probability: probabilidad de alerta de combustible bajo.
+    - out_of_fuel_probability: probabilidad de quedarse sin combustible.
+    """
+    truck_types = list(TRUCK_TYPES.keys() if truck_types is None else truck_types)
+    route_names = list(GPS_ROUTES.keys() if route_names is None else route_names)
+    for truck_type in truck_types:
+        if truck_type not in TRUCK_TYPES:
+            raise ValueError(f"Tipo de camión desconocido: {truck_type}")
+    for route_name in route_names:
+        if route_name not in GPS_ROUTES:
+            raise ValueError(f"Ruta desconocida: {route_name}")
+    if not 0 <= low_fuel_threshold < INITIAL_FUEL_FRACTION * 100:
+        raise ValueError("El umbral de combustible bajo debe estar entre 0 y el nivel inicial del tanque.")
+    if average_speed_kmh <= 0:
+        raise ValueError("La velocidad promedio debe ser mayor que 0.")
+    load_fractions = np.atleast_1d(np.asarray(load_fractions, dtype=float))
+    if load_fractions.ndim != 1 or np.any((load_fractions < 0) | (load_fractions > 1)):
+        raise ValueError("Las fracciones de carga deben ser una lista de valores entre 0 y 1.")
+
+    configs = [TRUCK_TYPES[truck_type] for truck_type in truck_types]
+    # Eje 0: tipo de camión
+    consumption_empty = np.array([c["fuel_consumption_empty"] for c in configs], dtype=float)[:, None, None]
+    consumption_full = np.array([c["fuel_consumption_full"] for c in configs], dtype=float)[:, None, None]
+    capacity_min = np.array([c["min_fuel_capacity"] for c in configs], dtype=float)[:, None, None]
+    capacity_max = np.array([c["max_fuel_capacity"] for c in configs], dtype=float)[:, None, None]
+    # Eje 1: ruta
+    distances = np.array([ROUTE_DISTANCES_KM[name] for name in route_names])[None, :, None]
+    # Eje 2: carga
+    loads = load_fractions[None, None, :]
+
+    consumption = consumption_empty + (consumption_full - consumption_empty) * loads
+    fuel_used = distances * consumption / 100.0
+
+    # Capacidad mínima de tanque para no agotar el combustible / no bajar del umbral
+    capacity_to_finish = fuel_used / INITIAL_FUEL_FRACTION
+    capacity_low_fuel = fuel_used * 100.0 / (INITIAL_FUEL_FRACTION * 100 - low_fuel_threshold)
+
+    shape = fuel_used.shape
+    return {
+        "truck_types": truck_types,
+        "route_names": route_names,
+        "load_fractions": loads.ravel(),
+        "eta_hours": np.broadcast_to(distances / average_speed_kmh, shape),
+        "fuel_used_liters": fuel_used,
+        "expected_fuel_liters": INITIAL_FUEL_FRACTION * _uniform_expected_excess(
+            capacity_to_finish, capacity_min, capacity_max
+        ),
+        "low_fuel_probability": _uniform_cdf(capacity_low_fuel, capacity_min, capacity_max),
+        "out_of_fuel_probability": _uniform_cdf(capacity_to_finish, capacity_min, capacity_max),
+    }
+
+
+def plan_to_dataframe(plan):
+    """Convierte el resultado de plan_trips en una tabla (una fila por combinación)."""
+    t, r, l = np.indices(plan["eta_hours"].shape).reshape(3, -1)
+    return pd.DataFrame({
+        "truck_type": np.array(plan["truck_types"], dtype=object)[t],
+        "route_name": np.array(plan["route_names"], dtype=object)[r],
+        "load_fraction": plan["load_fractions"][l],
+        "eta_hours": plan["eta_hours"].ravel(),
+        "fuel_used_liters": plan["fuel_used_liters"].ravel(),
+        "expected_fuel_liters": plan["expected_fuel_liters"].ravel(),
+        "low_fuel_probability": plan["low_fuel_probability"].ravel(),
+        "out_of_fuel_probability": plan["out_of_fuel_probability"].ravel(),
+    })
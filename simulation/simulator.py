@@ -1,7 +1,9 @@
 import time
 import datetime
+import math
 import streamlit as st
 from simulation.truck import Truck
+from simulation.theft_detector import WeightTheftDetector
 from utils.helpers import check_probability
 from config.settings import (
     FUEL_CONSUMPTION_RATE, SIMULATION_STEP_DELAY_SECONDS, LOW_FUEL_THRESHOLD,
@@ -12,8 +14,10 @@ import random
 class Simulator:
     """Orquesta la simulación del camión y sus sensores."""
 
-    def __init__(self, truck_type, route_name, probabilities):
+    def __init__(self, truck_type, route_name, probabilities, detect_theft=True):
         self.truck = Truck(truck_type, route_name)
+        # El detector es opcional: quien no usa las alertas (p. ej. el generador de carga) se ahorra su costo
+        self.theft_detector = WeightTheftDetector([self.truck.max_weight_capacity]) if detect_theft else None
         self.probabilities = probabilities # Diccionario con probabilidades de eventos
         self.running = False
         self._stop_requested = False
@@ -61,11 +65,8 @@ class Simulator:
                 current_location = self.truck.get_current_location()
                 status_placeholder.info(f"📍 En ruta... Ubicación actual: ({current_location[0]:.4f}, {current_location[1]:.4f})")
 
-                # Simular eventos aleatorios
-                self._simulate_events(current_location)
-
-                # Consumir combustible
-                self.truck.consume_fuel(FUEL_CONSUMPTION_RATE)
+                # Simular eventos aleatorios y consumir combustible
+                self.step()
                 self.truck.check_low_fuel(LOW_FUEL_THRESHOLD)
 
                 # Actualizar UI
@@ -135,6 +136,11 @@ class Simulator:
         # Reanuda el ciclo de simulación
         self.start()
 
+    def step(self):
+        """Ejecuta un paso de la simulación en la ubicación actual: eventos y consumo de combustible."""
+        self._simulate_events(self.truck.get_current_location())
+        self.truck.consume_fuel(FUEL_CONSUMPTION_RATE)
+
     def _simulate_events(self, location):
         """Simula la ocurrencia de eventos aleatorios."""
         # Sensor de Puerta
@@ -157,6 +163,17 @@ class Simulator:
         if self.truck.current_weight < 0.1 * self.truck.max_weight_capacity:
             self.truck.add_alert("ADVERTENCIA", "Pérdida de peso significativa detectada.")
 
+        # Detección de caídas anormales de peso (posible robo de carga)
+        if self.theft_detector is not None:
+            weights = [self.truck.current_weight]
+            locations = [location] if location else None
+            if self.theft_detector.update(weights, [self.truck.door_open], locations)[0]:
+                dropped = self.theft_detector.dropped_weight(weights)[0]
+                start_location = tuple(self.theft_detector.drop_start_locations()[0])
+                if any(math.isnan(coordinate) for coordinate in start_location): # Sin ubicación registrada
+                    start_location = None
+                self.truck.report_possible_theft(dropped, start_location)
+
     def _update_ui(self, status_placeholder, map_placeholder, charts_placeholder, alerts_placeholder):
         """Actualiza los componentes de la interfaz de Streamlit."""
         # Limpia placeholders antes de actualizar
@@ -0,0 +1,142 @@
+"""Detector en línea de robo de carga sobre la señal de peso de toda la flota.
+
+Por cada camión se observa la caída de peso entre muestras, normalizada por
+`max_weight_capacity`. Un promedio exponencial (EWMA) aprende la caída normal
+y un CUSUM acumula el exceso sobre ella; cuando el acumulado supera el umbral
+se marca una caída anormal. Con la puerta abierta el umbral se reduce.
+
+La holgura es de la mitad del menor aumento de pérdida por muestra que se
+quiere detectar, así que un robo lento y sostenido también se acumula. La
+línea base no se actualiza mientras el CUSUM está activo, para que el robo
+en curso no se aprenda como pérdida normal.
+
+El estado es un conjunto fijo de arreglos de numpy (una entrada por camión),
+así que cada muestra cuesta O(1) en memoria y tiempo, y la actualización de
+toda la flota se hace en una sola llamada vectorizada.
+"""
+import numpy as np
+
+DEFAULT_EWMA_ALPHA = 0.05 # Peso de cada muestra en la caída normal aprendida
+DEFAULT_INITIAL_BASELINE = 0.003 # Pérdida media del Simulator (0.1% - 0.5% por muestra)
+DEFAULT_SLACK = 0.001 # Mitad del menor aumento de pérdida por muestra a detectar (fracción de capacidad)
+DEFAULT_THRESHOLD = 0.02 # Exceso acumulado que dispara la alarma (fracción de capacidad)
+DEFAULT_DOOR_OPEN_FACTOR = 0.5 # Multiplicador del umbral con la puerta abierta
+
+
+class WeightTheftDetector:
+    """CUSUM/EWMA vectorizado sobre el peso de N camiones.
+
+    La flota puede crecer con `add`; cada camión se identifica por su índice.
+    """
+
+    def __init__(self, max_weight_capacities=(), ewma_alpha=DEFAULT_EWMA_ALPHA, slack=DEFAULT_SLACK,
+                 threshold=DEFAULT_THRESHOLD, door_open_factor=DEFAULT_DOOR_OPEN_FACTOR,
+                 initial_baseline=DEFAULT_INITIAL_BASELINE):
+        self.ewma_alpha = ewma_alpha
+        self.slack = slack
+        self.threshold = threshold
+        self.door_open_factor = door_open_factor
+        self.initial_baseline = float(initial_baseline)
+
+        self.size = 0
+        self._capacities = np.empty(0)
+        self._last_weight = np.empty(0) # NaN: sin muestra previa
+        self._baseline = np.empty(0) # Caída normal por muestra (EWMA)
+        self._cusum = np.empty(0)
+        # Datos del inicio de la caída en curso, para reportar la alarma
+        self._onset_weight = np.empty(0)
+        self._onset_location = np.empty((0, 2))
+        self.extend(max_weight_capacities)
+
+    def add(self, max_weight_capacity):
+        """Agrega un camión y devuelve su índice."""
+        return int(self.extend([max_weight_capacity])[0])
+
+    def extend(self, max_weight_capacities):
+        """Agrega varios camiones y devuelve sus índices.
+
+        Los arreglos internos duplican su tamaño al llenarse, así que agregar
+        camiones cuesta O(1) amortizado.
+        """
+        capacities = np.asarray(max_weight_capacities, dtype=float)
+        if capacities.ndim != 1 or np.any(capacities <= 0):
+            raise ValueError("Las capacidades deben ser un arreglo 1-D de valores positivos.")
+        start, end = self.size, self.size + capacities.shape[0]
+        if end > self._capacities.shape[0]:
+            self._grow(max(end, 2 * self._capacities.shape[0]))
+        self._capacities[start:end] = capacities
+        self._last_weight[start:end] = np.nan
+        self._baseline[start:end] = self.initial_baseline
+        self._cusum[start:end] = 0.0
+        self._onset_weight[start:end] = np.nan
+        self._onset_location[start:end] = np.nan
+        self.size = end
+        return np.arange(start, end)
+
+    def _grow(self, allocated):
+        """Reserva espacio para `allocated` camiones conservando el estado actual."""
+        def grown(array):
+            new = np.empty((allocated,) + array.shape[1:])
+            new[:self.size] = array[:self.size]
+            return new
+        self._capacities = grown(self._capacities)
+        self._last_weight = grown(self._last_weight)
+        self._baseline = grown(self._baseline)
+        self._cusum = grown(self._cusum)
+        self._onset_weight = grown(self._onset_weight)
+        self._onset_location = grown(self._onset_location)
+
+    def _index(self, indices):
+        return slice(0, self.size) if indices is None else np.asarray(indices, dtype=np.intp)
+
+    def update(self, weights, door_open=None, locations=None, indices=None):
+        """Procesa una muestra por camión y devuelve una máscara con las alarmas nuevas.
+
+        `weights` en toneladas, `door_open` booleanos y `locations` pares
+        (latitud, longitud; NaN si no se conoce). Sin `indices` se espera un
+        elemento por camión de la flota; con `indices` (sin repetidos) solo se
+        actualizan esos camiones, en ese orden.
+        """
+        index = self._index(indices)
+        weights = np.array(weights, dtype=float)
+        capacities = self._capacities[index]
+        baseline = self._baseline[index]
+        previous = self._cusum[index]
+
+        drop = (self._last_weight[index] - weights) / capacities
+        drop = np.where(np.isnan(drop), 0.0, drop) # Primera muestra
+        self._last_weight[index] = weights
+
+        excess = drop - baseline - self.slack
+        # La línea base solo aprende fuera de una caída en curso; la muestra se
+        # limita a baseline + slack para que el inicio de un robo no la contamine
+        learning = previous == 0
+        observed = np.clip(drop, 0.0, baseline + self.slack)
+        self._baseline[index] = np.where(learning, baseline + self.ewma_alpha * (observed - baseline), baseline)
+
+        cusum = np.maximum(0.0, previous + excess)
+        onset = (previous == 0) & (cusum > 0)
+        # Peso antes de la caída: el de esta muestra más lo que acaba de bajar
+        self._onset_weight[index] = np.where(onset, weights + drop * capacities, self._onset_weight[index])
+        onset_location = self._onset_location[index]
+        if locations is not None:
+            onset_location[onset] = np.asarray(locations, dtype=float)[onset]
+        else:
+            onset_location[onset] = np.nan # Sin ubicación: no reportar la de una caída anterior
+        self._onset_location[index] = onset_location
+
+        threshold = self.threshold
+        if door_open is not None:
+            threshold = np.where(np.asarray(door_open, dtype=bool), threshold * self.door_open_factor, threshold)
+        alarms = cusum > threshold
+        cusum[alarms] = 0.0 # Reinicia tras alarmar
+        self._cusum[index] = cusum
+        return alarms
+
+    def dropped_weight(self, weights, indices=None):
+        """Peso perdido (toneladas) desde el inicio de la caída en curso o la última alarmada."""
+        return self._onset_weight[self._index(indices)] - np.asarray(weights, dtype=float)
+
+    def drop_start_locations(self, indices=None):
+        """Ubicaciones (latitud, longitud) donde comenzó la caída en curso o la última alarmada."""
+        return self._onset_location[self._index(indices)].copy()
@@ -1,6 +1,6 @@
 import datetime
 import random
-from config.settings import TRUCK_TYPES, GPS_ROUTES
+from config.settings import TRUCK_TYPES, GPS_ROUTES, INITIAL_FUEL_FRACTION
 from utils.helpers import generate_random_value, calculate_percentage
 
 class Truck:
@@ -24,7 +24,7 @@ class Truck:
         )
 
         # Inicializar el combustible con un valor predeterminado del 88% de la capacidad total
-        self.current_fuel = 0.88 * self.fuel_capacity
+        self.current_fuel = INITIAL_FUEL_FRACTION * self.fuel_capacity
 
         # Estado actual (se inicializa al comenzar simulación)
         self.current_weight = 0.0
@@ -37,6 +37,7 @@ class Truck:
         self.is_loading = False
         self.is_unloading = False
         self.is_en_route = False
+        self.reported_location = None # Última ubicación reportada por un dispositivo real
 
 
     def start_loading(self):
@@ -106,6 +107,28 @@ class Truck:
             status = "abierta" if is_open else "cerrada"
             self.add_alert("ALERTA", f"Puerta {status}.", self.get_current_location())
 
+    def set_weight(self, weight):
+        """Establece el peso reportado por el sensor de pesaje (toneladas)."""
+        self.current_weight = max(0.0, weight)
+
+    def set_fuel_percentage(self, fuel_percentage):
+        """Establece el nivel de combustible a partir de un porcentaje del tanque."""
+        fuel_percentage = min(max(fuel_percentage, 0.0), 100.0)
+        self.current_fuel = (fuel_percentage / 100.0) * self.fuel_capacity
+
+    def update_location(self, latitude, longitude):
+        """Registra una ubicación GPS reportada y la asocia al punto más cercano de la ruta."""
+        self.reported_location = (latitude, longitude)
+        nearest_index = min(
+            range(len(self.route)),
+            key=lambda i: (self.route[i][0] - latitude) ** 2 + (self.route[i][1] - longitude) ** 2
+        )
+        if not self.is_en_route:
+            # Un dispositivo que reporta ubicación se considera en ruta
+            self.is_en_route = True
+            self.simulation_start_time = datetime.datetime.now()
+        self.current_location_index = nearest_index
+
     def trigger_panic_button(self):
         """Activa el botón de pánico."""
         self.panic_button_on = True # Se mantiene activo hasta reset manual? O solo evento? Asumimos evento.
@@ -121,6 +144,14 @@ class Truck:
             return True
         return False
 
+    def report_possible_theft(self, dropped_weight, start_location=None):
+        """Añade la alerta de posible robo de carga, con la ubicación donde comenzó la caída si se conoce."""
+        message = f"Posible robo de carga: caída anormal de {dropped_weight:.2f} toneladas"
+        if start_location:
+            self.add_alert("ALERTA", f"{message}; inicio de la caída", start_location)
+        else:
+            self.add_alert("ALERTA", f"{message}.")
+
     def check_low_fuel(self, threshold_percentage):
         """Verifica si el nivel de combustible es bajo."""
         fuel_percentage = self.get_fuel_percentage()
@@ -142,6 +173,8 @@ class Truck:
 
     def get_current_location(self):
         """Obtiene las coordenadas GPS actuales."""
+        if self.is_en_route and self.reported_location:
+            return self.reported_location
         if self.is_en_route and 0 <= self.current_location_index < len(self.route):
             return self.route[self.current_location_index]
         return None
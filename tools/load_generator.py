@@ -0,0 +1,442 @@
+"""Generador de carga con camiones virtuales para planeación de capacidad.
+
+Cada camión virtual recorre una ruta de GPS_ROUTES usando el Simulator con las
+probabilidades de eventos configuradas, y sus lecturas se envían al destino
+(HTTP, TCP o archivo) a una tasa agregada controlada.
+
+La planificación es de lazo abierto: cada mensaje tiene un instante de envío
+previsto que no depende de las respuestas anteriores, y la latencia se mide
+desde ese instante previsto (evita la omisión coordinada).
+
+Ejemplos:
+    python -m tools.load_generator http --trucks 500 --rate 2000 --duration 30 --profile linear --ramp 10
+    python -m tools.load_generator tcp --port 9000 --rate 5000 --storm panic --storm-at 15
+    python -m tools.load_generator file --path lecturas.ndjson --rate 1000
+"""
+import argparse
+import asyncio
+import collections
+import json
+import math
+import random
+import secrets
+import time
+import aiohttp
+from config.settings import (
+    TRUCK_TYPES, GPS_ROUTES, INGEST_HOST, INGEST_PORT,
+    DEFAULT_DOOR_OPEN_PROBABILITY, DEFAULT_PANIC_BUTTON_PROBABILITY, DEFAULT_OVERWEIGHT_PROBABILITY
+)
+from simulation.simulator import Simulator
+from utils.helpers import check_probability, generate_random_value
+
+SCHEDULE_SLICE_SECONDS = 0.001 # Resolución del planificador de envíos
+LATENCY_PERCENTILES = (50, 90, 99, 99.9)
+HISTOGRAM_MIN_SECONDS = 1e-6
+HISTOGRAM_MAX_SECONDS = 100.0
+HISTOGRAM_BUCKETS_PER_DECADE = 200
+
+
+class VirtualTruck:
+    """Camión virtual que produce lecturas paso a paso usando el núcleo de simulación."""
+
+    def __init__(self, truck_id, truck_type, route_name, probabilities):
+        self.truck_id = truck_id
+        # Sin detector de robo: las alertas locales se descartan
+        self.simulator = Simulator(truck_type, route_name, probabilities, detect_theft=False)
+        self._start_trip()
+
+    def _start_trip(self):
+        """Carga el camión e inicia (o reinicia) su recorrido."""
+        truck = self.simulator.truck
+        truck.start_loading()
+        if check_probability(self.simulator.probabilities.get("overweight", 0)):
+            # Carga con sobrepeso de 5% a 20% sobre la capacidad
+            truck.current_weight = generate_random_value(
+                1.05 * truck.max_weight_capacity, 1.2 * truck.max_weight_capacity
+            )
+        truck.start_route()
+
+    def next_reading(self):
+        """Avanza un paso de la simulación y devuelve la lectura resultante."""
+        truck = self.simulator.truck
+        self.simulator.step()
+        reading = self._reading()
+        # El pánico es un evento: se reporta una sola vez
+        truck.panic_button_on = False
+        # Las alertas locales no se usan; evitar que crezcan sin límite
+        truck.alerts.clear()
+        if not truck.advance_route():
+            self._start_trip()
+        return reading
+
+    def storm_reading(self, storm):
+        """Lectura de una ráfaga de flota: botón de pánico o puerta abierta."""
+        reading = self._reading()
+        if storm == "panic":
+            reading["panic"] = True
+        else:
+            reading["door_open"] = True
+        return reading
+
+    def _reading(self):
+        truck = self.simulator.truck
+        lat, lon = truck.get_current_location()
+        return {
+            "truck_id": self.truck_id,
+            "truck_type": truck.truck_type,
+            "route_name": truck.route_name,
+            "door_open": truck.door_open,
+            "panic": truck.panic_button_on,
+            "weight": truck.current_weight,
+            "fuel": truck.get_fuel_percentage(),
+            "lat": lat,
+            "lon": lon,
+        }
+
+
+def create_fleet(count, probabilities, truck_type=None, route_name=None, id_prefix="virtual"):
+    """Crea `count` camiones virtuales con tipo y ruta fijos o aleatorios.
+
+    Los identificadores llevan `id_prefix` para que corridas distintas contra el
+    mismo servidor no reutilicen camiones registrados con otro tipo o ruta.
+    """
+    truck_types = list(TRUCK_TYPES.keys())
+    route_names = list(GPS_ROUTES.keys())
+    return [
+        VirtualTruck(
+            f"{id_prefix}-{i}",
+            truck_type or random.choice(truck_types),
+            route_name or random.choice(route_names),
+            probabilities,
+        )
+        for i in range(count)
+    ]
+
+
+def rate_at(t, rate, profile, ramp, steps):
+    """Tasa objetivo (mensajes/s) en el instante t según el perfil de rampa."""
+    if profile == "constant" or ramp <= 0 or t >= ramp:
+        return rate
+    if profile == "linear":
+        return rate * t / ramp
+    # Escalones de igual duración hasta alcanzar la tasa objetivo
+    return rate * (math.floor(t / ramp * steps) + 1) / steps
+
+
+def schedule(rate, duration, profile="constant", ramp=0.0, steps=4):
+    """Genera los instantes de envío previstos (segundos desde el inicio).
+
+    Los mensajes de cada intervalo de SCHEDULE_SLICE_SECONDS se reparten de forma
+    uniforme dentro del intervalo; la fracción sobrante pasa al siguiente.
+    """
+    dt = SCHEDULE_SLICE_SECONDS
+    pending = 0.0
+    for k in range(int(round(duration / dt))):
+        slice_start = k * dt
+        pending += rate_at(slice_start + dt / 2, rate, profile, ramp, steps) * dt
+        count = int(pending)
+        pending -= count
+        for i in range(count):
+            yield slice_start + (i + 0.5) * dt / count
+
+
+class HttpTarget:
+    """Envía cada lectura con POST a un endpoint HTTP."""
+
+    def __init__(self, url, connections):
+        self.url = url
+        self.connections = connections
+        self.session = None
+
+    async def open(self):
+        connector = aiohttp.TCPConnector(limit=self.connections)
+        self.session = aiohttp.ClientSession(connector=connector)
+
+    def start(self, stats):
+        pass
+
+    async def send(self, reading, intended, stats):
+        try:
+            async with self.session.post(self.url, json=reading) as response:
+                await response.read()
+                ok = response.status < 400
+        except (aiohttp.ClientError, OSError):
+            ok = False
+        stats.record(intended, ok)
+
+    async def close(self):
+        await self.session.close()
+
+
+class TcpTarget:
+    """Envía lecturas como JSON por línea sobre conexiones TCP y empareja las respuestas en orden."""
+
+    def __init__(self, host, port, connections):
+        self.host = host
+        self.port = port
+        self.connections = connections
+        self._streams = []
+        self._readers = []
+        self._next = 0
+
+    async def open(self):
+        for _ in range(self.connections):
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            self._streams.append((writer, collections.deque()))
+            self._readers.append((reader, self._streams[-1][1]))
+
+    def start(self, stats):
+        """Empieza a leer las respuestas de cada conexión."""
+        self._reader_tasks = [
+            asyncio.ensure_future(self._read_responses(reader, in_flight, stats))
+            for reader, in_flight in self._readers
+        ]
+
+    async def _read_responses(self, reader, in_flight, stats):
+        while True:
+            line = await reader.readline()
+            if not line:
+                # Conexión cerrada: lo pendiente se cuenta como error
+                while in_flight:
+                    stats.record(in_flight.popleft(), False)
+                return
+            stats.record(in_flight.popleft(), b'"error"' not in line)
+
+    async def send(self, reading, intended, stats):
+        writer, in_flight = self._streams[self._next]
+        self._next = (self._next + 1) % len(self._streams)
+        in_flight.append(intended)
+        writer.write(json.dumps(reading).encode() + b"\n")
+
+    async def close(self):
+        for writer, _ in self._streams:
+            writer.close()
+        for task in self._reader_tasks:
+            task.cancel()
+
+
+class FileTarget:
+    """Escribe lecturas como JSON por línea en un archivo."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    async def open(self):
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    def start(self, stats):
+        pass
+
+    async def send(self, reading, intended, stats):
+        self.file.write(json.dumps(reading) + "\n")
+        self.file.flush()
+        stats.record(intended, True)
+
+    async def close(self):
+        self.file.close()
+
+
+class LatencyHistogram:
+    """Histograma logarítmico de latencias con memoria fija.
+
+    Cubre de HISTOGRAM_MIN_SECONDS a HISTOGRAM_MAX_SECONDS con
+    HISTOGRAM_BUCKETS_PER_DECADE cubetas por década (error relativo ~1%).
+    """
+
+    def __init__(self):
+        self._log_min = math.log10(HISTOGRAM_MIN_SECONDS)
+        decades = math.log10(HISTOGRAM_MAX_SECONDS) - self._log_min
+        self.counts = [0] * (int(decades * HISTOGRAM_BUCKETS_PER_DECADE) + 1)
+        self.total = 0
+        self.max = 0.0
+
+    def record(self, latency):
+        self.total += 1
+        self.max = max(self.max, latency)
+        if latency <= HISTOGRAM_MIN_SECONDS:
+            index = 0
+        else:
+            index = int((math.log10(latency) - self._log_min) * HISTOGRAM_BUCKETS_PER_DECADE)
+        self.counts[min(index, len(self.counts) - 1)] += 1
+
+    def percentile(self, p):
+        """Latencia (segundos) del percentil p, usando el límite superior de la cubeta."""
+        rank = math.ceil(p / 100.0 * self.total)
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                upper = 10 ** (self._log_min + (index + 1) / HISTOGRAM_BUCKETS_PER_DECADE)
+                return min(upper, self.max)
+        return self.max
+
+
+class LoadStats:
+    """Acumula latencias (desde el instante previsto) y errores."""
+
+    def __init__(self):
+        self.start = None
+        self.latencies = LatencyHistogram()
+        self.errors = 0
+        self.sent = 0
+        self.last_completion = None
+
+    def record(self, intended, ok):
+        now = time.perf_counter()
+        self.last_completion = now
+        if ok:
+            self.latencies.record(now - (self.start + intended))
+        else:
+            self.errors += 1
+
+    @property
+    def completed(self):
+        return self.latencies.total + self.errors
+
+    def report(self, target_messages, duration):
+        """Devuelve un diccionario con percentiles de latencia y rendimiento."""
+        elapsed = (self.last_completion - self.start) if self.last_completion else duration
+        ok = self.latencies.total
+        report = {
+            "target_messages": target_messages,
+            "sent": self.sent,
+            "ok": ok,
+            "errors": self.errors,
+            "lost": self.sent - self.completed,
+            "target_rate": target_messages / duration,
+            "achieved_rate": ok / elapsed if elapsed > 0 else 0.0,
+        }
+        if ok:
+            for p in LATENCY_PERCENTILES:
+                report[f"p{p}_ms"] = self.latencies.percentile(p) * 1000.0
+            report["max_ms"] = self.latencies.max * 1000.0
+        return report
+
+
+async def run_load(target, fleet, rate, duration, profile="constant", ramp=0.0, steps=4,
+                   storm=None, storm_at=None, drain_timeout=5.0):
+    """Ejecuta la prueba de carga de lazo abierto y devuelve el reporte."""
+    if storm:
+        storm_at = duration / 2 if storm_at is None else storm_at
+        if not 0 <= storm_at < duration:
+            raise ValueError("El instante de la ráfaga debe estar dentro de la duración de la prueba.")
+    stats = LoadStats()
+    await target.open()
+    tasks = set()
+
+    def finished(task, intended):
+        tasks.discard(task)
+        # Un envío que falla con una excepción cuenta como error, no se pierde
+        if not task.cancelled() and task.exception() is not None:
+            stats.record(intended, False)
+
+    def dispatch(reading, intended):
+        task = asyncio.ensure_future(target.send(reading, intended, stats))
+        tasks.add(task)
+        task.add_done_callback(lambda task: finished(task, intended))
+        stats.sent += 1
+
+    async def wait_until(intended):
+        delay = stats.start + intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def fire_storm():
+        # La ráfaga envía una lectura por camión en el mismo instante previsto
+        await wait_until(storm_at)
+        for truck in fleet:
+            dispatch(truck.storm_reading(storm), storm_at)
+
+    stats.start = time.perf_counter()
+    target.start(stats)
+
+    target_messages = 0
+    storm_pending = bool(storm)
+    truck_index = 0
+    for intended in schedule(rate, duration, profile, ramp, steps):
+        if storm_pending and intended >= storm_at:
+            await fire_storm()
+            storm_pending = False
+        await wait_until(intended)
+        dispatch(fleet[truck_index].next_reading(), intended)
+        truck_index = (truck_index + 1) % len(fleet)
+        target_messages += 1
+    if storm_pending:
+        # La ráfaga cae después del último envío programado
+        await fire_storm()
+    if storm:
+        target_messages += len(fleet)
+
+    # Esperar las respuestas pendientes
+    deadline = time.perf_counter() + drain_timeout
+    while stats.completed < stats.sent and time.perf_counter() < deadline:
+        await asyncio.sleep(0.01)
+    for task in list(tasks):
+        task.cancel()
+    await target.close()
+    return stats.report(target_messages, duration)
+
+
+def print_report(report):
+    print(f"Mensajes objetivo: {report['target_messages']}  Enviados: {report['sent']}  "
+          f"OK: {report['ok']}  Errores: {report['errors']}  Sin respuesta: {report['lost']}")
+    print(f"Tasa objetivo: {report['target_rate']:.0f} msg/s  Tasa lograda: {report['achieved_rate']:.0f} msg/s")
+    if "max_ms" in report:
+        percentiles = "  ".join(f"p{p}={report[f'p{p}_ms']:.2f}" for p in LATENCY_PERCENTILES)
+        print(f"Latencia (ms): {percentiles}  max={report['max_ms']:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador de carga con camiones virtuales.")
+    parser.add_argument("target", choices=["http", "tcp", "file"])
+    parser.add_argument("--url", default=f"http://{INGEST_HOST}:{INGEST_PORT}/readings", help="Destino HTTP.")
+    parser.add_argument("--host", default=INGEST_HOST, help="Host TCP.")
+    parser.add_argument("--port", type=int, default=9000, help="Puerto TCP.")
+    parser.add_argument("--path", default="lecturas.ndjson", help="Archivo de salida.")
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--trucks", type=int, default=100)
+    parser.add_argument("--id-prefix", help="Prefijo de los identificadores (por defecto, uno aleatorio por corrida).")
+    parser.add_argument("--truck-type", choices=list(TRUCK_TYPES.keys()))
+    parser.add_argument("--route", choices=list(GPS_ROUTES.keys()))
+    parser.add_argument("--door-prob", type=float, default=DEFAULT_DOOR_OPEN_PROBABILITY)
+    parser.add_argument("--panic-prob", type=float, default=DEFAULT_PANIC_BUTTON_PROBABILITY)
+    parser.add_argument("--overweight-prob", type=float, default=DEFAULT_OVERWEIGHT_PROBABILITY)
+    parser.add_argument("--rate", type=float, default=1000, help="Tasa agregada objetivo (mensajes/s).")
+    parser.add_argument("--duration", type=float, default=10, help="Duración en segundos.")
+    parser.add_argument("--profile", choices=["constant", "linear", "step"], default="constant")
+    parser.add_argument("--ramp", type=float, default=0.0, help="Duración de la rampa en segundos.")
+    parser.add_argument("--steps", type=int, default=4, help="Escalones del perfil 'step'.")
+    parser.add_argument("--storm", choices=["panic", "door"], help="Ráfaga de toda la flota.")
+    parser.add_argument("--storm-at", type=float, help="Instante de la ráfaga (por defecto, a la mitad).")
+    parser.add_argument("--drain-timeout", type=float, default=5.0)
+    args = parser.parse_args()
+    for name in ("trucks", "connections", "steps", "rate", "duration"):
+        if getattr(args, name) <= 0:
+            parser.error(f"--{name} debe ser mayor que 0.")
+    if args.storm and args.storm_at is not None and not 0 <= args.storm_at < args.duration:
+        parser.error("--storm-at debe estar entre 0 y --duration.")
+
+    probabilities = {
+        "door_open": args.door_prob,
+        "panic_button": args.panic_prob,
+        "overweight": args.overweight_prob,
+    }
+    id_prefix = args.id_prefix or f"virtual-{secrets.token_hex(3)}"
+    fleet = create_fleet(args.trucks, probabilities, args.truck_type, args.route, id_prefix)
+    if args.target == "http":
+        target = HttpTarget(args.url, args.connections)
+    elif args.target == "tcp":
+        target = TcpTarget(args.host, args.port, args.connections)
+    else:
+        target = FileTarget(args.path)
+
+    report = asyncio.run(run_load(
+        target, fleet, args.rate, args.duration, args.profile, args.ramp, args.steps,
+        args.storm, args.storm_at, args.drain_timeout,
+    ))
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()